@@ -1,8 +1,16 @@
-import time
+import os
+import sys
+import platform
+from pathlib import Path
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+
+# The shared Chrome helpers live next to the WedMeGood scrapers
+sys.path.insert(0, str(Path(__file__).resolve().parent / "WedMeGood Scraper"))
+from driver_service import USER_AGENT, load_page, make_service, wait_ready
+
+# CSS markers that only exist once a vendor profile has finished rendering
+PAGE_READY_SELECTORS = ("h1.h4.text-bold", "div.vendor-details h1", "div.addr-right")
 
 def fetch_page_html(url: str, output_filename: str = "caterer_page.html"):
     """
@@ -12,29 +20,50 @@ def fetch_page_html(url: str, output_filename: str = "caterer_page.html"):
     print("Setting up WebDriver...")
     # --- Configure Chrome Options ---
     chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run without opening a visible browser window
-    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--headless=new")  # Run without opening a visible browser window
+    # --disable-gpu is only still needed on some Linux CI images
+    if platform.system() == "Linux" and os.environ.get("CI"):
+        chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--log-level=3") # Suppress non-essential console logs
     chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    # Skip background services, extensions and image downloads a scrape never needs
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Reuse cookies and cached assets from earlier runs
+    profile = Path.home() / ".cache" / "planiva" / "chrome-profile" / "fetch_page_html"
+    profile.mkdir(parents=True, exist_ok=True)
+    chrome_options.add_argument(f"--user-data-dir={profile}")
+    chrome_options.add_argument(f"--disk-cache-dir={profile / 'disk-cache'}")
+    chrome_options.add_argument(f"--disk-cache-size={500 * 1024 * 1024}")
+    # Return from get() at DOMContentLoaded instead of waiting for every subresource
+    chrome_options.page_load_strategy = 'eager'
 
     # --- Initialize WebDriver ---
-    service = Service(ChromeDriverManager().install())
+    # CHROMEDRIVER_PATH, then a chromedriver on PATH, then the cached webdriver-manager download
+    service = make_service()
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    driver.set_page_load_timeout(20)
+    driver.set_script_timeout(10)
     
     print(f"WebDriver setup complete.")
 
     try:
         print(f"\nNavigating to: {url}")
-        driver.get(url)
+        load_page(driver, url)
         
         # --- Wait for Dynamic Content ---
-        # Adjust this wait time if the page is very slow to load
-        wait_time = 8 
-        print(f"Waiting for {wait_time} seconds for the page to load completely...")
-        time.sleep(wait_time)
+        # Returns as soon as the profile markup is rendered instead of sleeping blindly
+        print("Waiting for the page content to render...")
+        if not wait_ready(driver, PAGE_READY_SELECTORS):
+            print("Timed out waiting for the profile content, saving whatever has loaded.")
         
         # --- Get Page Source ---
         print("Retrieving the final page HTML...")
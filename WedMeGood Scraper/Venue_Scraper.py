@@ -1,5 +1,8 @@
-import json
+import os
+import logging
+import platform
 import time
+import weakref
 import re
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -7,14 +10,58 @@ from urllib.parse import urlparse
 
 # Selenium Imports
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
-# BeautifulSoup Import
-from bs4 import BeautifulSoup
+import orjson
 
-# --- BeautifulSoup Helper Function ---
+# lxml Imports
+import lxml.html
+from lxml import etree
+
+from browser_pool import BrowserPool
+from driver_service import (BLOCKED_URL_PATTERNS, USER_AGENT, add_profile_arguments, claim_profile_dir, load_page,
+                            make_service, release_profile_dir, wait_ready)
+from journal import append_record, load_records
+
+logger = logging.getLogger(__name__)
+
+# Containers read by _parse_html; any one of them means the venue page has rendered
+VENUE_READY_SELECTORS = ("div.VendorPricing", "div.addr-right", "div.AreasAvailable")
+
+# Patterns used on every page, compiled once
+# The first number in a price and the lakh/crore unit that follows it, matched in one search
+_PRICE_RE = re.compile(r'(?P<num>[\d,]+\.?\d*)(?:.*?(?P<unit>lakh|crore))?', re.IGNORECASE | re.DOTALL)
+_UNIT_MULTIPLIERS = {'lakh': 100000, 'crore': 10000000}
+_DIGITS_RE = re.compile(r'\d+')
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching elements that carry `name` as one of their classes."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Top-level containers read by _parse_html, all collected in one pass over the document
+_VENUE_SECTIONS = ("addr-right", "VendorPricing", "DestinationWeddingPricing", "AreasAvailable", "AboutSection")
+_SECTIONS_XP = etree.XPath("//title | //div[" + " or ".join(_has_class(c) for c in _VENUE_SECTIONS) + "]")
+
+# Lookups inside a section, compiled once
+_F_SPACE_BETWEEN_XP = etree.XPath(f".//div[{_has_class('f-space-between')}]")
+_FROW_XP = etree.XPath(f".//div[{_has_class('frow')}]")
+_H5_XP = etree.XPath(f".//p[{_has_class('h5')}]")
+_PRICE_XP = etree.XPath(f".//div[{_has_class('price')}]")
+_FLEX_50_XP = etree.XPath(f".//*[{_has_class('flex-50')}]")
+_SMALL_XP = etree.XPath(f".//div[{_has_class('small')}]")
+_FAQS_XP = etree.XPath(f".//div[{_has_class('faqs')}]")
+_H6_XP = etree.XPath(".//h6")
+_P_XP = etree.XPath(".//p")
+_P_WITH_TEXT_XP = etree.XPath(".//p[. = $text]")
+_NEXT_SPANS_XP = etree.XPath("following-sibling::span")
+_NEXT_P_XP = etree.XPath("following-sibling::p[1]")
+
+def _first(xpath: etree.XPath, node, **variables):
+    """Returns the first element matched by a compiled XPath, or None."""
+    matches = xpath(node, **variables)
+    return matches[0] if matches else None
+
+# --- Price Helper Function ---
 def convert_price_to_int(price_text: str) -> Optional[int]:
     """
     Converts a price string (e.g., "1,50,000", "₹15.00 Lakhs") into an integer.
@@ -23,47 +70,67 @@ def convert_price_to_int(price_text: str) -> Optional[int]:
     if not price_text:
         return None
     
-    price_text = price_text.replace('₹', '').strip()
-    numeric_part_search = re.search(r'[\d,]+\.?\d*', price_text)
-    if not numeric_part_search:
+    match = _PRICE_RE.search(price_text)
+    if not match:
         return None
         
-    numeric_part = numeric_part_search.group(0).replace(',', '')
-    number = float(numeric_part)
-    
-    lower_text = price_text.lower()
-    if 'lakh' in lower_text:
-        return int(number * 100000)
-    elif 'crore' in lower_text:
-        return int(number * 10000000)
-    else:
-        return int(number)
+    number = float(match['num'].replace(',', ''))
+    unit = match['unit']
+    return int(number * _UNIT_MULTIPLIERS[unit.lower()]) if unit else int(number)
 
 
 class HybridScraper:
-    def __init__(self, debug: bool = True):
+    def __init__(self, debug: bool = True, pool: Optional[BrowserPool] = None):
         self.debug = debug
         self.debug_dir = Path("debug_html")
         self.debug_dir.mkdir(exist_ok=True)
-        self.driver = self._setup_driver()
+        # Borrow browsers from a shared pool if one is given, otherwise keep a private single-browser pool
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else BrowserPool(self._setup_driver, min_size=1, max_size=1)
         
     def _setup_driver(self):
         """Set up and configure the Chrome WebDriver."""
-        print("Setting up WebDriver...")
+        logger.debug("Setting up WebDriver...")
         chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--headless=new")
+        # --disable-gpu is only still needed on some Linux CI images
+        if platform.system() == "Linux" and os.environ.get("CI"):
+            chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--disable-dev-shm-usage")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--log-level=3")
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
         chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        chrome_options.add_argument(f"user-agent={USER_AGENT}")
+        # Skip background services, extensions and image downloads a scrape never needs
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # Reuse cookies and cached assets from earlier runs
+        profile = claim_profile_dir()
+        add_profile_arguments(chrome_options, profile)
+        # Return from get() at DOMContentLoaded instead of waiting for every subresource
+        chrome_options.page_load_strategy = 'eager'
         
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        print("WebDriver setup complete.")
+        service = make_service()
+        try:
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except Exception:
+            release_profile_dir(profile)
+            raise
+        # Free the profile slot once this driver is gone
+        weakref.finalize(driver, release_profile_dir, profile)
+        driver.set_page_load_timeout(20)
+        driver.set_script_timeout(10)
+        # Drop images, fonts, stylesheets and trackers before they hit the network
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        logger.debug("WebDriver setup complete.")
         return driver
     
     def _save_debug_file(self, content: str, filename: str):
@@ -76,110 +143,128 @@ class HybridScraper:
         return None
 
     def scrape_venue(self, url: str) -> Dict[str, Any]:
-        """Scrapes venue information from a URL using BeautifulSoup on rendered HTML."""
+        """Scrapes venue information from a URL by parsing the rendered HTML with lxml."""
         if not urlparse(url).scheme:
-            print(f"Error: Invalid URL provided: {url}")
+            logger.error("Invalid URL provided: %s", url)
             return {}
             
-        print(f"Loading page: {url}")
+        logger.debug("Loading page: %s", url)
         try:
-            self.driver.get(url)
-            time.sleep(5)
-            
-            html_content = self.driver.page_source
+            with self.pool.acquire() as driver:
+                load_page(driver, url)
+                if not wait_ready(driver, VENUE_READY_SELECTORS):
+                    logger.warning("Timed out waiting for venue content on %s, parsing whatever has loaded.", url)
+                
+                html_content = driver.page_source
+                source_url = driver.current_url
             self._save_debug_file(html_content, 'rendered_page.html')
             
-            print("Using BeautifulSoup to parse the rendered HTML.")
-            venue_data = self._parse_html_with_bs4(html_content)
+            venue_data = self._parse_html(html_content, source_url)
             
             if not venue_data or not venue_data.get("name") or venue_data.get("name") == "N/A":
-                print("Error: HTML parsing failed to extract meaningful data.")
+                logger.error("HTML parsing failed to extract meaningful data from %s", url)
                 return {}
             
             return venue_data
             
-        except Exception as e:
-            print(f"An unexpected error occurred during scraping: {e}")
+        except Exception:
+            logger.exception("An unexpected error occurred while scraping %s", url)
             return {}
 
-    def _parse_html_with_bs4(self, html_content: str) -> Dict[str, Any]:
-        """Parses the rendered HTML content using BeautifulSoup to extract venue details."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def _parse_html(self, html_content: str, source_url: str) -> Dict[str, Any]:
+        """Parses the rendered HTML content with lxml XPath queries to extract venue details."""
+        root = lxml.html.fromstring(html_content)
+
+        # Single pass: pick up the first <title> and the first div of each section
+        sections = {}
+        for node in _SECTIONS_XP(root):
+            if node.tag == 'title':
+                sections.setdefault('title', node)
+                continue
+            for css_class in node.get('class', '').split():
+                if css_class in _VENUE_SECTIONS:
+                    sections.setdefault(css_class, node)
         
-        name_tag = soup.find('title')
-        name = name_tag.text.split('|')[0].strip() if name_tag else "N/A"
+        name_tag = sections.get('title')
+        name = name_tag.text_content().split('|')[0].strip() if name_tag is not None else "N/A"
 
-        address_tag = soup.find('div', class_='addr-right')
-        address = address_tag.text.strip() if address_tag else "N/A"
+        address_tag = sections.get('addr-right')
+        address = address_tag.text_content().strip() if address_tag is not None else "N/A"
 
         pricing_info = {}
-        vendor_pricing_container = soup.find('div', class_='VendorPricing')
-        if vendor_pricing_container:
+        vendor_pricing_container = sections.get('VendorPricing')
+        if vendor_pricing_container is not None:
             # Patterns 1 & 2: Veg/Non-Veg, Decor
-            for div in vendor_pricing_container.find_all('div', class_='f-space-between'):
-                if 'Veg price' in div.text:
-                    veg_tag = div.find('p', class_='h5')
-                    if veg_tag: pricing_info['veg_price_per_plate'] = convert_price_to_int(veg_tag.text)
-                if 'Non Veg price' in div.text:
-                    non_veg_tag = div.find('p', class_='h5')
-                    if non_veg_tag: pricing_info['non_veg_price_per_plate'] = convert_price_to_int(non_veg_tag.text)
+            for div in _F_SPACE_BETWEEN_XP(vendor_pricing_container):
+                # 'Non Veg price' also contains 'Veg price', so a non-veg row sets both keys
+                div_text = div.text_content()
+                if 'Veg price' in div_text:
+                    price_tag = _first(_H5_XP, div)
+                    if price_tag is not None:
+                        price = convert_price_to_int(price_tag.text_content())
+                        pricing_info['veg_price_per_plate'] = price
+                        if 'Non Veg price' in div_text: pricing_info['non_veg_price_per_plate'] = price
             
-            decor_price_title = vendor_pricing_container.find('p', string='Starting Price of Decor')
-            if decor_price_title:
-                price_spans = decor_price_title.find_next_siblings('span')
+            decor_price_title = _first(_P_WITH_TEXT_XP, vendor_pricing_container, text='Starting Price of Decor')
+            if decor_price_title is not None:
+                price_spans = _NEXT_SPANS_XP(decor_price_title)
                 if len(price_spans) > 1:
-                    pricing_info['starting_price_decor'] = convert_price_to_int(price_spans[1].text)
+                    pricing_info['starting_price_decor'] = convert_price_to_int(price_spans[1].text_content())
             
-            # --- MODIFICATION START: MORE ROBUST RENTAL COST PATTERN ---
             # Pattern 3: Rental Cost / Price per function
             # This approach finds all potential price containers and checks their cleaned text.
             # This correctly handles cases with HTML comments or extra whitespace around the label.
-            price_containers = vendor_pricing_container.find_all('div', class_='frow')
-            for container in price_containers:
-                container_text = container.get_text(strip=True).lower()
+            for container in _FROW_XP(vendor_pricing_container):
+                container_text = "".join(part.strip() for part in container.itertext()).lower()
                 if 'rental cost' in container_text or 'per function' in container_text:
-                    price_tag = container.find('p', class_='h5')
-                    if price_tag:
-                        pricing_info['rental_cost'] = convert_price_to_int(price_tag.text)
+                    price_tag = _first(_H5_XP, container)
+                    if price_tag is not None:
+                        pricing_info['rental_cost'] = convert_price_to_int(price_tag.text_content())
                         break 
-            # --- MODIFICATION END ---
 
         # Pattern 4: Destination Wedding Price
-        dest_wedding_container = soup.find('div', class_='DestinationWeddingPricing')
-        if dest_wedding_container:
-            price_tag = dest_wedding_container.find('div', class_='price')
-            if price_tag:
-                pricing_info['destination_wedding_price'] = convert_price_to_int(price_tag.text)
+        dest_wedding_container = sections.get('DestinationWeddingPricing')
+        if dest_wedding_container is not None:
+            price_tag = _first(_PRICE_XP, dest_wedding_container)
+            if price_tag is not None:
+                pricing_info['destination_wedding_price'] = convert_price_to_int(price_tag.text_content())
         
         capacity = []
-        areas_available = soup.find('div', class_='AreasAvailable')
-        if areas_available:
-            for area in areas_available.find_all(class_='flex-50'):
+        areas_available = sections.get('AreasAvailable')
+        if areas_available is not None:
+            for area in _FLEX_50_XP(areas_available):
                 details = {}
-                seating_floating = area.find('h6')
-                if seating_floating and '|' in seating_floating.text:
-                    parts = seating_floating.text.split('|')
-                    details['seating'] = int(re.search(r'\d+', parts[0]).group()) if re.search(r'\d+', parts[0]) else None
-                    details['floating'] = int(re.search(r'\d+', parts[1]).group()) if len(parts) > 1 and re.search(r'\d+', parts[1]) else None
+                seating_floating = _first(_H6_XP, area)
+                seating_floating_text = seating_floating.text_content() if seating_floating is not None else ""
+                if '|' in seating_floating_text:
+                    parts = seating_floating_text.split('|')
+                    seating = _DIGITS_RE.search(parts[0])
+                    floating = _DIGITS_RE.search(parts[1]) if len(parts) > 1 else None
+                    details['seating'] = int(seating.group()) if seating else None
+                    details['floating'] = int(floating.group()) if floating else None
                 
-                details['area'] = area.find('p').text.strip() if area.find('p') else "N/A"
-                details['type'] = area.find('div', class_='small').text.strip() if area.find('div', class_='small') else "N/A"
+                area_name = _first(_P_XP, area)
+                area_type = _first(_SMALL_XP, area)
+                details['area'] = area_name.text_content().strip() if area_name is not None else "N/A"
+                details['type'] = area_type.text_content().strip() if area_type is not None else "N/A"
                 capacity.append(details)
                 
         policies = {}
         room_count = None
-        about_section = soup.find('div', class_='AboutSection')
-        if about_section and about_section.find('div', class_='faqs'):
-            faqs = about_section.find('div', class_='faqs')
+        about_section = sections.get('AboutSection')
+        faqs = _first(_FAQS_XP, about_section) if about_section is not None else None
+        if faqs is not None:
             policy_map = {'Catering policy': 'catering', 'Decor Policy': 'decor', 'Outside Alcohol': 'alcohol', 'DJ Policy': 'dj'}
             for title, key in policy_map.items():
-                tag = faqs.find('p', string=title)
-                if tag and tag.find_next_sibling('p'): policies[key] = tag.find_next_sibling('p').text.strip()
+                tag = _first(_P_WITH_TEXT_XP, faqs, text=title)
+                answer = _first(_NEXT_P_XP, tag) if tag is not None else None
+                if answer is not None: policies[key] = answer.text_content().strip()
 
-            room_tag = faqs.find('p', string='Room Count')
-            if room_tag and room_tag.find_next_sibling('p'):
-                room_text = room_tag.find_next_sibling('p').text
-                room_digits = re.search(r'\d+', room_text)
+            room_tag = _first(_P_WITH_TEXT_XP, faqs, text='Room Count')
+            room_answer = _first(_NEXT_P_XP, room_tag) if room_tag is not None else None
+            if room_answer is not None:
+                room_text = room_answer.text_content()
+                room_digits = _DIGITS_RE.search(room_text)
                 if room_digits: room_count = int(room_digits.group(0))
 
         return {
@@ -189,48 +274,63 @@ class HybridScraper:
             "capacity": capacity,
             "policies": policies,
             "room_count": room_count,
-            "source_url": self.driver.current_url
+            "source_url": source_url
         }
 
     def close(self):
-        """Close the WebDriver."""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        """Close the WebDriver, unless it belongs to a pool shared with other scrapers."""
+        if self._owns_pool:
+            self.pool.close()
 
 def main():
     """Main function to run the scraper."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     urls_to_scrape = [
         "https://www.wedmegood.com/wedding-venues/Fiestaa-Resort-n-Events-Venue-409062",
 
 ]
     
     all_venues_data = []
+    output_file = "scraped_venues_data.json"
+    # Each venue is also appended here as soon as it is scraped, so a killed run keeps its progress
+    journal_file = output_file + ".ndjson"
+    # Venues saved by an interrupted run are reused instead of being scraped again. They are matched
+    # on the URL the page ended up at, so a venue that redirected is simply scraped once more.
+    resumed = {venue_data.get('source_url'): venue_data for venue_data in load_records(journal_file)}
+    if resumed:
+        logger.info("Resuming: %d venue(s) already scraped in '%s' will be skipped.", len(resumed), journal_file)
     scraper = HybridScraper(debug=True)
     
     try:
-        for url in urls_to_scrape:
-            print(f"\n--- Starting to scrape: {url} ---")
-            start_time = time.time()
+        with open(journal_file, 'ab') as journal:
+            for url in urls_to_scrape:
+                if url in resumed:
+                    all_venues_data.append(resumed[url])
+                    continue
+
+                logger.debug("Starting to scrape: %s", url)
+                start_time = time.time()
             
-            venue_data = scraper.scrape_venue(url)
-            elapsed_time = time.time() - start_time
+                venue_data = scraper.scrape_venue(url)
+                elapsed_time = time.time() - start_time
             
-            if venue_data and (venue_data.get('pricing') or venue_data.get('capacity')):
-                print(f"--- Scraping successful for {venue_data.get('name', 'N/A')} in {elapsed_time:.2f} seconds ---")
-                print(f"    Found prices: {venue_data.get('pricing')}")
-                all_venues_data.append(venue_data)
-            else:
-                print(f"--- Scraping failed or found no key data for {url} after {elapsed_time:.2f} seconds ---")
+                if venue_data and (venue_data.get('pricing') or venue_data.get('capacity')):
+                    logger.info("scraped %s in %.2fs", venue_data.get('name', 'N/A'), elapsed_time)
+                    logger.debug("Found prices: %s", venue_data.get('pricing'))
+                    all_venues_data.append(venue_data)
+                    append_record(journal, venue_data)
+                else:
+                    logger.warning("Scraping failed or found no key data for %s after %.2fs", url, elapsed_time)
 
         if all_venues_data:
-            output_file = "scraped_venues_data.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(all_venues_data, f, indent=4, ensure_ascii=False)
-            print(f"\nSuccessfully scraped {len(all_venues_data)} venues. Results saved to: {output_file}")
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(all_venues_data, option=orjson.OPT_INDENT_2))
+            os.remove(journal_file)
+            logger.info("Successfully scraped %d venues. Results saved to: %s", len(all_venues_data), output_file)
 
     finally:
         scraper.close()
-        print("\nScraping process finished and WebDriver closed.")
+        logger.info("Scraping process finished and WebDriver closed.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import argparse
+import time
+from typing import Dict, Any, List, Optional
+
+import orjson
+from playwright.async_api import async_playwright, Browser, Route, TimeoutError as PlaywrightTimeoutError
+
+from caterers_scraper import CATERER_READY_SELECTORS, parse_caterer_html
+from driver_service import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+# Subresources the parser never reads; aborted by Playwright's router before they are requested
+BLOCKED_RESOURCE_TYPES = {"image", "font", "stylesheet", "media"}
+
+
+async def _block_route(route: Route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def scrape(url: str, browser: Browser, limit: asyncio.Semaphore) -> Optional[Dict[str, Any]]:
+    """
+    Renders one caterer page in its own browser context and parses it with
+    parse_caterer_html. At most `limit` pages are open at the same time.
+    """
+    async with limit:
+        context = None
+        try:
+            context = await browser.new_context(user_agent=USER_AGENT)
+            await context.route("**/*", _block_route)
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
+            try:
+                await page.wait_for_selector(", ".join(CATERER_READY_SELECTORS), state="attached", timeout=10000)
+            except PlaywrightTimeoutError:
+                logger.warning("Timed out waiting for %s to render, parsing what has loaded.", url)
+            html_content = await page.content()
+        except Exception as e:
+            logger.error("FAILED to load URL %s. Error: %s", url, e)
+            return None
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning("Could not close the browser context for %s. Error: %s", url, e)
+
+    caterer_data = parse_caterer_html(html_content)
+    caterer_data["source_url"] = url
+    logger.info("scraped %s", caterer_data.get('name', 'N/A'))
+    return caterer_data
+
+
+async def scrape_all(urls: List[str], concurrency: int = 8) -> List[Dict[str, Any]]:
+    """Scrapes every URL with one headless Chromium, keeping the results in URL order."""
+    limit = asyncio.Semaphore(concurrency)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            # A page that raises must not throw away the pages already scraped
+            results = await asyncio.gather(*[scrape(url, browser, limit) for url in urls], return_exceptions=True)
+        finally:
+            await browser.close()
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.error("FAILED to process URL %s. Error: %s", url, result)
+    return [caterer_data for caterer_data in results if caterer_data and not isinstance(caterer_data, Exception)]
+
+
+# --- Main Execution Block ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape caterer profiles from WedMeGood with async Playwright.")
+    parser.add_argument("urls", nargs="+", help="caterer profile URLs to scrape")
+    parser.add_argument("--output", "-o", default="caterers_data.json", help="JSON file to write the results to")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="pages rendered at the same time")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    start_time = time.time()
+    all_caterers_data = asyncio.run(scrape_all(args.urls, args.concurrency))
+
+    if all_caterers_data:
+        with open(args.output, 'wb') as f:
+            f.write(orjson.dumps(all_caterers_data, option=orjson.OPT_INDENT_2))
+        logger.info("Scraped data from %d URLs in %.2fs. All results have been saved to '%s'",
+                    len(all_caterers_data), time.time() - start_time, args.output)
+    else:
+        logger.warning("No data was scraped. The output file will not be created.")
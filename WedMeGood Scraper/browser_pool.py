@@ -0,0 +1,150 @@
+import os
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Iterator, Optional, Tuple
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
+
+
+def _env_number(name: str, default: float) -> float:
+    """Reads a numeric pool setting from the environment, falling back to `default`."""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class BrowserPool:
+    """
+    Keeps warm WebDriver instances that scrapers borrow and hand back, so Chrome is
+    launched once per worker instead of once per script or per URL.
+
+    Sizing falls back to the SCRAPER_POOLING_MIN_SIZE, SCRAPER_POOLING_MAX_SIZE and
+    SCRAPER_POOLING_IDLE_TIMEOUT (seconds) environment variables when not passed in.
+    """
+
+    def __init__(self, factory: Callable[[], WebDriver], min_size: Optional[int] = None,
+                 max_size: Optional[int] = None, idle_timeout: Optional[float] = None):
+        self._factory = factory
+        self.min_size = int(min_size if min_size is not None else _env_number("SCRAPER_POOLING_MIN_SIZE", 1))
+        self.max_size = int(max_size if max_size is not None else _env_number("SCRAPER_POOLING_MAX_SIZE", 4))
+        self.idle_timeout = idle_timeout if idle_timeout is not None else _env_number("SCRAPER_POOLING_IDLE_TIMEOUT", 300)
+        if self.max_size < 1 or not 0 <= self.min_size <= self.max_size:
+            raise ValueError(f"Invalid pool size: min_size={self.min_size}, max_size={self.max_size}")
+
+        # Idle drivers with the time they were handed back, oldest on the left
+        self._idle: Deque[Tuple[WebDriver, float]] = deque()
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._timer: Optional[threading.Timer] = None
+
+        for _ in range(self.min_size):
+            self._idle.append((self._factory(), time.monotonic()))
+        self._schedule_eviction()
+
+    @contextmanager
+    def acquire(self) -> Iterator[WebDriver]:
+        """
+        Borrows a healthy driver for the duration of the `with` block, blocking while
+        `max_size` drivers are already in use. This is the only way to borrow a driver;
+        it is handed back automatically when the block exits.
+        """
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+
+        self._slots.acquire()
+        try:
+            driver = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def _release(self, driver: WebDriver):
+        """
+        Hands a driver borrowed through acquire() back to the pool (or quits it if the pool
+        is closed) and frees its slot. Only acquire() may call this, once per driver.
+        """
+        try:
+            with self._lock:
+                if not self._closed:
+                    self._idle.append((driver, time.monotonic()))
+                    driver = None
+            if driver is not None:
+                self._quit(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Stops idle eviction and quits every idle driver."""
+        with self._lock:
+            self._closed = True
+            if self._timer:
+                self._timer.cancel()
+            idle = [driver for driver, _ in self._idle]
+            self._idle.clear()
+        for driver in idle:
+            self._quit(driver)
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _checkout(self) -> WebDriver:
+        """Returns the most recently used idle driver that still responds, or a new one."""
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                return self._factory()
+
+            driver = entry[0]
+            if self._is_alive(driver):
+                return driver
+            logger.warning("Discarding an unresponsive WebDriver from the pool.")
+            self._quit(driver)
+
+    @staticmethod
+    def _is_alive(driver: WebDriver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: WebDriver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _schedule_eviction(self):
+        if self._closed or self.idle_timeout <= 0:
+            return
+        self._timer = threading.Timer(self.idle_timeout / 2, self._evict_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _evict_idle(self):
+        """Quits drivers idle for longer than `idle_timeout`, keeping at least `min_size`."""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            if self._closed:
+                return
+            while len(self._idle) > self.min_size and now - self._idle[0][1] >= self.idle_timeout:
+                expired.append(self._idle.popleft()[0])
+        for driver in expired:
+            self._quit(driver)
+        self._schedule_eviction()
@@ -1,15 +1,51 @@
 import time
+import weakref
 import os
+import logging
+import platform
 import json
 import re
+import argparse
+import hashlib
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-from typing import Dict, Any, Optional, List
+import httpx
+import orjson
+import ahocorasick
+from selectolax.lexbor import LexborHTMLParser
+from typing import Dict, Any, Optional, List, Tuple
 
-# --- BS4 Helper Function (No changes) ---
+from browser_pool import BrowserPool
+from driver_service import (BLOCKED_URL_PATTERNS, USER_AGENT, add_profile_arguments, claim_profile_dir, load_page,
+                            make_service, release_profile_dir, wait_ready)
+from html_text import joined_text
+from journal import append_record, load_records
+
+logger = logging.getLogger(__name__)
+
+# Containers read by parse_caterer_html; any one of them means the profile has rendered
+CATERER_READY_SELECTORS = ("div.vendor-details h1", "div.VendorPricing", "div.addr-right")
+
+# --- The Master List of Cuisines to search for ---
+PREDEFINED_CUISINES = {
+    "North Indian", "South Indian", "Chinese", "Italian", "Thai",
+    "Desserts", "Rajasthani", "Maharashtrian", "Gujarati", "Bengali", "Japanese"
+}
+# Automaton over the lowercase cuisine names, yielding the correctly capitalized name,
+# so every cuisine is found in a single pass over the text
+_CUISINES_AC = ahocorasick.Automaton()
+for _cuisine in PREDEFINED_CUISINES:
+    _CUISINES_AC.add_word(_cuisine.lower(), _cuisine)
+_CUISINES_AC.make_automaton()
+
+# Patterns used on every page, compiled once
+_DIGITS_RE = re.compile(r'\d+')
+_CUISINES_RE = re.compile(r'cuisines offered:?', re.IGNORECASE)
+
+# --- Price Helper Function ---
 def convert_price_to_int(price_text: str) -> Optional[int]:
     """
     Cleans a price string (e.g., "₹499<!-- -->&nbsp;") and converts it to an integer.
@@ -18,79 +54,74 @@ def convert_price_to_int(price_text: str) -> Optional[int]:
     if not price_text:
         return None
     
-    price_digits = re.findall(r'\d+', price_text)
+    price_digits = _DIGITS_RE.findall(price_text)
     
     if not price_digits:
         return None
         
     return int("".join(price_digits))
 
-# --- BS4 Parsing Function (MODIFIED) ---
+
+# --- Parsing Function (selectolax) ---
 def parse_caterer_html(html_content: str) -> Dict[str, Any]:
     """
     Parses the HTML content of a single caterer page and returns a structured dictionary.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
 
     # --- Name Extraction ---
     name = "N/A"
-    vendor_details_div = soup.select_one('div.vendor-details')
+    vendor_details_div = tree.css_first('div.vendor-details')
     if vendor_details_div:
-        name_tag = vendor_details_div.find('h1')
+        name_tag = vendor_details_div.css_first('h1')
         if name_tag:
-            name = name_tag.get_text(strip=True)
+            name = name_tag.text(strip=True)
 
     # --- Address Extraction ---
     address = "N/A"
-    address_div = soup.select_one('div.addr-right')
+    address_div = tree.css_first('div.addr-right')
     if address_div:
-        address_span = address_div.find('span')
+        address_span = address_div.css_first('span')
         if address_span:
-            address = address_span.get_text(strip=True)
+            address = address_span.text(strip=True)
 
     # --- Pricing Extraction ---
     pricing_info = {}
-    price_title_tags = soup.select('div.grid__col p.text-bold')
+    price_title_tags = tree.css('div.grid__col p.text-bold')
     for tag in price_title_tags:
-        key = tag.get_text(strip=True).lower().replace(' ', '_')
-        price_spans = tag.parent.find_all('span', class_='text-tertiary')
+        key = tag.text(strip=True).lower().replace(' ', '_')
+        price_spans = tag.parent.css('span.text-tertiary')
         if len(price_spans) > 1:
-            pricing_info[key] = convert_price_to_int(price_spans[1].text)
+            pricing_info[key] = convert_price_to_int(price_spans[1].text())
 
-    price_label_containers = soup.find_all('div', class_='frow')
+    price_label_containers = tree.css('div.frow')
     for container in price_label_containers:
-        container_text = container.get_text(strip=True).lower()
-        price_tag = container.find('p', class_='h5')
+        container_text = container.text(strip=True).lower()
+        price_tag = container.css_first('p.h5')
         if not price_tag:
             continue
         
         if 'veg price per plate' in container_text:
-            pricing_info['veg_price_per_plate'] = convert_price_to_int(price_tag.text)
+            pricing_info['veg_price_per_plate'] = convert_price_to_int(price_tag.text())
         elif 'non veg price per plate' in container_text:
-            pricing_info['non_veg_price_per_plate'] = convert_price_to_int(price_tag.text)
+            pricing_info['non_veg_price_per_plate'] = convert_price_to_int(price_tag.text())
 
     # --- Caterer Details Extraction ---
     about_text = None
     full_details_text = ""
     cuisines_set = set() 
     
-    # --- The Master List of Cuisines to search for ---
-    PREDEFINED_CUISINES = {
-        "North Indian", "South Indian", "Chinese", "Italian", "Thai",
-        "Desserts", "Rajasthani", "Maharashtrian", "Gujarati", "Bengali", "Japanese"
-    }
-    
-    about_body = soup.find('div', class_='about-body border-t')
+    about_body = tree.css_first('div.about-body.border-t')
     
     if about_body:
         # --- Step 1: Extract all text from the relevant section ---
-        info_div = about_body.find('div', class_='info padding-h-20 padding-v-20')
+        info_div = about_body.css_first('div.info.padding-h-20.padding-v-20')
         if info_div:
-            full_details_text = info_div.get_text(separator='\n', strip=True)
+            full_details_text = joined_text(info_div, '\n')
             
             # Cleanly extract the "About" text by splitting it from the cuisine list if present
-            if re.search(r'Cuisines offered', full_details_text, re.IGNORECASE):
-                about_text = re.split(r'Cuisines offered:?', full_details_text, flags=re.IGNORECASE, maxsplit=1)[0].strip()
+            if _CUISINES_RE.search(full_details_text):
+                about_text = _CUISINES_RE.split(full_details_text, maxsplit=1)[0].strip()
             else:
                 about_text = full_details_text
         
@@ -98,10 +129,9 @@ def parse_caterer_html(html_content: str) -> Dict[str, Any]:
         # Search the extracted text for matches from our master list.
         if full_details_text:
             text_lower = full_details_text.lower()
-            for cuisine in PREDEFINED_CUISINES:
-                # Check if the predefined cuisine (e.g., "north indian") is in the text
-                if cuisine.lower() in text_lower:
-                    cuisines_set.add(cuisine) # Add the correctly capitalized version
+            # Find every predefined cuisine (e.g., "north indian") in one pass over the text,
+            # keeping the correctly capitalized version
+            cuisines_set = {cuisine for _, cuisine in _CUISINES_AC.iter(text_lower)}
 
     # --- Final JSON Structure ---
     return {
@@ -114,71 +144,220 @@ def parse_caterer_html(html_content: str) -> Dict[str, Any]:
         }
     }
 
-# --- Selenium Function for Multiple URLs (No changes) ---
-def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "caterers_data.json"):
+# --- Scrape Cache ---
+# One JSON file per URL holding the hash of the last rendered HTML and its parsed data
+CACHE_DIR = Path(".scrape_cache")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+def _load_cache(url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
     """
-    Initializes a single WebDriver instance to navigate to a list of URLs, 
-    fetches the HTML for each, parses the data, and saves all results
-    into a single JSON file.
+    Returns the cached entry for a URL (or None if there is none) and whether
+    it is recent enough to skip loading the page altogether.
     """
-    print("Setting up WebDriver...")
+    path = _cache_path(url)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        is_fresh = time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS
+    except (OSError, ValueError):
+        return None, False
+    return entry, is_fresh
+
+def _store_cache(url: str, html_sha: str, parsed: Dict[str, Any]):
+    """Writes a cache entry atomically so an interrupted run never leaves a half-written file."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"url": url, "html_sha": html_sha, "parsed": parsed}, f, ensure_ascii=False)
+        os.replace(tmp_path, _cache_path(url))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# --- Selenium Helpers ---
+def _setup_driver() -> webdriver.Chrome:
+    """Creates a headless Chrome WebDriver configured for scraping."""
     chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--headless=new")
+    # --disable-gpu is only still needed on some Linux CI images
+    if platform.system() == "Linux" and os.environ.get("CI"):
+        chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920,1080")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--log-level=3")
     chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    # Skip background services, extensions and image downloads a scrape never needs
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    # Reuse cookies and cached assets from earlier runs
+    profile = claim_profile_dir()
+    add_profile_arguments(chrome_options, profile)
+    # Return from get() at DOMContentLoaded instead of waiting for every subresource
+    chrome_options.page_load_strategy = 'eager'
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    print(f"WebDriver setup complete.")
-    
-    all_caterers_data = []
+    service = make_service()
+    try:
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+    except Exception:
+        release_profile_dir(profile)
+        raise
+    # Free the profile slot once this driver is gone
+    weakref.finalize(driver, release_profile_dir, profile)
+    driver.set_page_load_timeout(20)
+    driver.set_script_timeout(10)
+    # Drop images, fonts, stylesheets and trackers before they hit the network
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
 
+def _parse_page(url: str, html_content: str, cached: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+    """
+    Parses a caterer page and returns the data with the SHA-1 of the HTML. If the hash
+    matches the one in `cached`, the cached parse is reused instead of parsing again.
+    """
+    html_sha = hashlib.sha1(html_content.encode('utf-8')).hexdigest()
+    if cached and cached.get('html_sha') == html_sha:
+        logger.debug("Page unchanged since last scrape, reusing cached data for %s", url)
+        return cached['parsed'], html_sha
+
+    caterer_data = parse_caterer_html(html_content)
+    caterer_data['source_url'] = url
+    return caterer_data, html_sha
+
+def fast_fetch(client: httpx.Client, url: str, cached: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+    """
+    Tries to scrape a caterer page from its server-rendered HTML with a plain HTTP request.
+    Returns None if the request fails or the name/pricing fields are missing, meaning the
+    page needs a real browser to render them.
+    """
     try:
-        for i, url in enumerate(urls):
-            print("-" * 50)
-            print(f"Processing URL {i+1}/{len(urls)}: {url}")
-            
-            try:
-                driver.get(url)
-                wait_time = 8 
-                print(f"Waiting for {wait_time} seconds...")
-                time.sleep(wait_time)
-                
-                print("Retrieving and parsing HTML...")
-                html_content = driver.page_source
-                caterer_data = parse_caterer_html(html_content)
-                
-                caterer_data['source_url'] = url
-                
-                all_caterers_data.append(caterer_data)
-                print(f"-> Successfully parsed data for: {caterer_data.get('name', 'N/A')}")
-
-            except Exception as e:
-                print(f"-> FAILED to process URL {url}. Error: {e}")
-                continue
-
-        if not all_caterers_data:
-            print("\nNo data was scraped. The output file will not be created.")
+        response = client.get(url)
+        response.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.debug("Plain HTTP fetch failed for %s (%s), falling back to Selenium.", url, e)
+        return None
+
+    caterer_data, html_sha = _parse_page(url, response.text, cached)
+    if caterer_data.get('name') == "N/A" or not caterer_data.get('pricing'):
+        logger.debug("Server-rendered HTML is incomplete for %s, falling back to Selenium.", url)
+        return None
+    return caterer_data, html_sha
+
+def _scrape_one(driver: webdriver.Chrome, url: str, cached: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], str]:
+    """Loads a single caterer page in the given driver and parses the rendered HTML."""
+    load_page(driver, url)
+    if not wait_ready(driver, CATERER_READY_SELECTORS):
+        logger.warning("Timed out waiting for profile content on %s, parsing whatever has loaded.", url)
+
+    return _parse_page(url, driver.page_source, cached)
+
+# --- Selenium Function for Multiple URLs ---
+def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "caterers_data.json",
+                                  num_workers: Optional[int] = None, pool: Optional[BrowserPool] = None,
+                                  force_refresh: bool = False):
+    """
+    Fetches and parses the given URLs concurrently with `num_workers` threads and saves
+    all results into a single JSON file in the original URL order. Each page is first
+    requested over plain HTTP; only pages that need JavaScript are rendered with a
+    headless WebDriver borrowed from `pool` (a private pool is created if none is given).
+    While running, each parsed record is appended to `output_filename + ".ndjson"` so
+    that a killed run keeps its progress and the next run skips the URLs it already scraped;
+    the journal is removed once the final file is written.
+    URLs scraped within CACHE_TTL_SECONDS are served from the scrape cache unless
+    `force_refresh` is set.
+    """
+    if not urls:
+        logger.warning("No URLs were given. Nothing to scrape.")
+        return
+
+    num_workers = num_workers or min(pool.max_size if pool else 8, len(urls))
+    owns_pool = pool is None
+
+    def scrape_url(url: str) -> Dict[str, Any]:
+        cached, is_fresh = (None, False) if force_refresh else _load_cache(url)
+        if is_fresh:
+            logger.debug("Using cached data for %s", url)
+            return cached['parsed']
+
+        result = fast_fetch(http_client, url, cached)
+        if result is None:
+            with pool.acquire() as driver:
+                result = _scrape_one(driver, url, cached)
+        caterer_data, html_sha = result
+        # A page that never rendered its name is a failed load; leave it uncached so it is retried
+        if caterer_data.get('name') != "N/A":
+            _store_cache(url, html_sha, caterer_data)
+        return caterer_data
+
+    results = []
+    journal_filename = output_filename + ".ndjson"
+    # Resume from the records saved by an interrupted run. Pages that failed to render
+    # (no caterer name) are left out, so their URLs are scraped again.
+    positions = {url: i for i, url in enumerate(urls)}
+    for caterer_data in load_records(journal_filename):
+        if caterer_data.get('name') != "N/A" and caterer_data.get('source_url') in positions:
+            results.append((positions[caterer_data['source_url']], caterer_data))
+    seen = {caterer_data['source_url'] for _, caterer_data in results}
+    if seen:
+        logger.info("Resuming: %d URL(s) already scraped in '%s' will be skipped.", len(seen), journal_filename)
+    http_client = httpx.Client(http2=True, headers={"user-agent": USER_AGENT}, timeout=10.0, follow_redirects=True)
+
+    try:
+        if owns_pool:
+            # Drivers are started lazily, the first time a worker needs one
+            pool = BrowserPool(_setup_driver, min_size=0, max_size=num_workers)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor, open(journal_filename, 'ab') as journal:
+            futures = {executor.submit(scrape_url, url): (i, url) for i, url in enumerate(urls) if url not in seen}
+            for done, future in enumerate(as_completed(futures), start=1):
+                i, url = futures[future]
+                logger.debug("Finished URL %d/%d: %s", done, len(futures), url)
+                try:
+                    caterer_data = future.result()
+                except Exception as e:
+                    logger.error("FAILED to process URL %s. Error: %s", url, e)
+                    continue
+
+                results.append((i, caterer_data))
+                append_record(journal, caterer_data)
+                logger.info("scraped %s (%d/%d)", caterer_data.get('name', 'N/A'), done, len(futures))
+
+        if not results:
+            logger.warning("No data was scraped. The output file will not be created.")
             return
 
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_caterers_data, f, indent=4, ensure_ascii=False)
+        all_caterers_data = [caterer_data for _, caterer_data in sorted(results, key=lambda r: r[0])]
+
+        with open(output_filename, 'wb') as f:
+            f.write(orjson.dumps(all_caterers_data, option=orjson.OPT_INDENT_2))
+        os.remove(journal_filename)
             
-        print("-" * 50)
-        print(f"\nSUCCESS: Scraped data from {len(all_caterers_data)} URLs.")
-        print(f"All results have been saved to '{output_filename}'")
+        logger.info("Scraped data from %d URLs. All results have been saved to '%s'", len(all_caterers_data), output_filename)
 
     finally:
-        print("Closing WebDriver.")
-        driver.quit()
+        http_client.close()
+        if owns_pool and pool is not None:
+            logger.debug("Closing WebDriver instances.")
+            pool.close()
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape caterer profiles from WedMeGood.")
+    parser.add_argument("--force-refresh", action="store_true",
+                        help=f"ignore the scrape cache in '{CACHE_DIR}' and re-fetch every page")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
     # --- IMPORTANT: PASTE THE CATERER'S URLs HERE ---
     target_urls = [
         "https://www.wedmegood.com/profile/Aahara-by-Siri-Weddings-25638716",
@@ -263,4 +442,4 @@ if __name__ == "__main__":
 "https://www.wedmegood.com/profile/SFM-Caterers-558573"
     ]
     
-    fetch_and_parse_multiple_urls(urls=target_urls)
\ No newline at end of file
+    fetch_and_parse_multiple_urls(urls=target_urls, force_refresh=args.force_refresh)
\ No newline at end of file
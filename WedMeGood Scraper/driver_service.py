@@ -0,0 +1,187 @@
+import functools
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import IO, Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Subresources the parsers never read; blocked via CDP so pages load faster
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.mp4", "*.css",
+    "*/analytics*", "*/gtag*", "*/facebook*",
+]
+
+# Path resolved by webdriver-manager, shared between runs and re-resolved daily or when Chrome updates
+DRIVER_PATH_CACHE = Path.home() / ".cache" / "planiva" / "chromedriver_path.json"
+DRIVER_PATH_TTL_SECONDS = 24 * 60 * 60
+
+_CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+_CHROME_VERSION_RE = re.compile(r'(\d+)\.\d+')
+_resolve_lock = threading.Lock()
+
+# Chrome profiles (cookies, HTTP/disk cache, TLS sessions) kept between runs. Each concurrent
+# driver gets its own numbered slot, since Chrome can't share a user data dir between instances.
+CHROME_PROFILE_ROOT = Path.home() / ".cache" / "planiva" / "chrome-profile"
+DISK_CACHE_SIZE = 500 * 1024 * 1024
+
+_profile_locks: Dict[Path, IO] = {}
+_profile_lock = threading.Lock()
+
+
+def _chrome_major_version() -> Optional[str]:
+    """Returns the major version of the installed Chrome, or None if it can't be determined."""
+    for name in _CHROME_BINARIES:
+        binary = shutil.which(name)
+        if not binary:
+            continue
+        try:
+            output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = _CHROME_VERSION_RE.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _read_cached_path(chrome_major: Optional[str]) -> Optional[str]:
+    """Returns the path saved by a previous run if it is still valid for this Chrome."""
+    try:
+        with open(DRIVER_PATH_CACHE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if (time.time() - cached["resolved_at"] < DRIVER_PATH_TTL_SECONDS
+                and cached["chrome_major"] == chrome_major
+                and os.path.exists(cached["path"])):
+            return cached["path"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_driver_path() -> str:
+    chrome_major = _chrome_major_version()
+    path = _read_cached_path(chrome_major)
+    if path:
+        return path
+
+    path = ChromeDriverManager().install()
+    try:
+        DRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(DRIVER_PATH_CACHE, 'w', encoding='utf-8') as f:
+            json.dump({"path": path, "chrome_major": chrome_major, "resolved_at": time.time()}, f)
+    except OSError:
+        pass
+    return path
+
+
+def driver_path() -> str:
+    """
+    Returns the chromedriver binary path, resolving it at most once per process and
+    skipping webdriver-manager entirely when a recent run already resolved it.
+    """
+    # Pool workers start drivers concurrently; only one of them should run the resolution
+    with _resolve_lock:
+        return _resolve_driver_path()
+
+
+def make_service() -> Service:
+    """
+    Returns a chromedriver Service, preferring the CHROMEDRIVER_PATH environment variable
+    and then a chromedriver on PATH, so webdriver-manager only runs when neither exists.
+    """
+    path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver") or driver_path()
+    return Service(path)
+
+
+def load_page(driver, url: str):
+    """Navigates to `url`; if the load times out, stops it and keeps whatever DOM has loaded."""
+    try:
+        driver.get(url)
+    except TimeoutException:
+        logger.warning("Page load timed out for %s, continuing with the partially loaded page.", url)
+        driver.execute_script("window.stop();")
+
+
+def wait_ready(driver, selectors, timeout: int = 10) -> bool:
+    """
+    Waits until any of the given CSS selectors is present on the page.
+    Returns False (after a short grace sleep) if none of them show up within `timeout` seconds.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.any_of(*[EC.presence_of_element_located((By.CSS_SELECTOR, s)) for s in selectors])
+        )
+        return True
+    except TimeoutException:
+        time.sleep(1)
+        return False
+
+
+def _try_lock(lock_file: IO) -> bool:
+    """Takes a non-blocking exclusive lock on an open file, returning False if it is held elsewhere."""
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def claim_profile_dir() -> Path:
+    """
+    Returns the first persistent Chrome profile slot not in use by another driver in this or
+    any other process. The slot stays locked until release_profile_dir() or process exit.
+    """
+    with _profile_lock:
+        slot = 0
+        while True:
+            profile = CHROME_PROFILE_ROOT / str(slot)
+            if profile not in _profile_locks:
+                profile.mkdir(parents=True, exist_ok=True)
+                lock_file = open(CHROME_PROFILE_ROOT / f"{slot}.lock", 'a+')
+                if _try_lock(lock_file):
+                    _profile_locks[profile] = lock_file
+                    return profile
+                lock_file.close()
+            slot += 1
+
+
+def release_profile_dir(profile: Path):
+    """Unlocks a slot returned by claim_profile_dir() so another driver can reuse it."""
+    with _profile_lock:
+        lock_file = _profile_locks.pop(profile, None)
+    if lock_file:
+        lock_file.close()
+
+
+def add_profile_arguments(chrome_options, profile: Path):
+    """Points Chrome at a persistent profile slot and its disk cache."""
+    chrome_options.add_argument(f"--user-data-dir={profile}")
+    chrome_options.add_argument(f"--disk-cache-dir={profile / 'disk-cache'}")
+    chrome_options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
@@ -0,0 +1,4 @@
+def joined_text(node, separator: str) -> str:
+    """Joins a selectolax node's stripped, non-empty text fragments, like BS4's get_text(separator, strip=True)."""
+    parts = (child.text_content.strip() for child in node.traverse(include_text=True) if child.tag == '-text')
+    return separator.join(part for part in parts if part)
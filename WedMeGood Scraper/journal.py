@@ -0,0 +1,33 @@
+from typing import IO, Any, Dict, List
+
+import orjson
+
+# Resume journals: one JSON record per line, appended and flushed as each page is scraped,
+# so a run that is killed keeps its progress and the next run can pick up from it
+
+
+def load_records(journal_filename: str) -> List[Dict[str, Any]]:
+    """Reads the records saved by an earlier run that did not finish."""
+    records = []
+    line = b""
+    try:
+        with open(journal_filename, 'rb') as f:
+            for line in f:
+                try:
+                    records.append(orjson.loads(line))
+                except ValueError:
+                    pass # A line cut short when the run was killed
+    except FileNotFoundError:
+        return records
+
+    # Terminate a cut-off last line so new records start on a line of their own
+    if line and not line.endswith(b'\n'):
+        with open(journal_filename, 'ab') as f:
+            f.write(b'\n')
+    return records
+
+
+def append_record(journal: IO[bytes], record: Dict[str, Any]):
+    """Writes one record as a JSON line and flushes it, so it survives a crash."""
+    journal.write(orjson.dumps(record) + b'\n')
+    journal.flush()
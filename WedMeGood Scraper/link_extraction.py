@@ -1,14 +1,14 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+
+from driver_service import make_service
 
 # The URL of the webpage from which to extract links
 url = "https://www.wedmegood.com/vendors/bangalore/bridal-makeup/?page=5"
 # Set up the Chrome driver
-# This will automatically download and manage the chromedriver
+# Uses CHROMEDRIVER_PATH or a chromedriver on PATH if there is one, else webdriver-manager (cached between runs)
 try:
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+    driver = webdriver.Chrome(service=make_service())
     print("WebDriver initialized successfully.")
 except Exception as e:
     print(f"Error initializing WebDriver: {e}")
@@ -1,157 +1,124 @@
-import time
-import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import logging
+import ahocorasick
+from selectolax.lexbor import LexborHTMLParser
 from typing import Dict, Any, List
 
-# --- BS4 Parsing Function for Makeup Artist Page (Corrected) ---
+from html_text import joined_text
+from profile_scraper import scrape_profiles
+
+PREDEFINED_SERVICES = frozenset({
+    "Bridal Makeup", "Engagement Makeup", "Party Makeup", "Family Makeup", "Roka", 
+    "Mehendi", "Receptions", "HD Makeup", "Airbrush Makeup", "Waterproof Makeup",
+    "Sweat-resistant", "Glam Makeup", "Natural Makeup", "Draping", "Hair Styling",
+    "False Lashes", "Extensions", "Chic hairstyles", "Travels to venue", "Paid trial"
+})
+
+# Patterns used on every page, compiled once
+_PRICE_SPLIT_RE = re.compile(r'₹([\d,]+)(.*)')
+# Hyphens and spaces in a price title, turned into underscores for its key
+_KEY_SEP_RE = re.compile(r'[- ]')
+
+# Automaton over the lowercase service names, so every service is found in a single pass
+_SERVICES_AC = ahocorasick.Automaton()
+for _service in PREDEFINED_SERVICES:
+    _SERVICES_AC.add_word(_service.lower(), _service)
+_SERVICES_AC.make_automaton()
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+def _find_services(text_lower: str) -> set:
+    """Returns the services whose names appear in the text as whole words, not inside longer words."""
+    found = set()
+    for end, service in _SERVICES_AC.iter(text_lower):
+        start = end - len(service) + 1
+        if (start == 0 or not _is_word_char(text_lower[start - 1])) and \
+                (end + 1 == len(text_lower) or not _is_word_char(text_lower[end + 1])):
+            found.add(service)
+    return found
+
+# --- Parsing Function for Makeup Artist Page (selectolax) ---
 def parse_makeup_artist_html(html_content: str) -> Dict[str, Any]:
     """
     Parses the HTML content of a single makeup artist's page and returns a structured dictionary.
     This version includes corrected logic for accurately parsing all pricing information.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
 
     # --- Name and Address Extraction ---
-    name = soup.select_one('h1.h4.text-bold').get_text(strip=True) if soup.select_one('h1.h4.text-bold') else "N/A"
-    address = soup.select_one('div.addr-right h6 > span').get_text(strip=True) if soup.select_one('div.addr-right h6 > span') else "N/A"
+    name_tag = tree.css_first('h1.h4.text-bold')
+    name = name_tag.text(strip=True) if name_tag else "N/A"
+    address_tag = tree.css_first('div.addr-right h6 > span')
+    address = address_tag.text(strip=True) if address_tag else "N/A"
 
     # --- Pricing Extraction ---
     pricing_info = {}
     
     # 1. Extract the main bridal makeup price
-    main_price_section = soup.select_one('div.VendorPricing div.f-space-between.sc-jzJRlG.emSbxZ')
+    main_price_section = tree.css_first('div.VendorPricing div.f-space-between.sc-jzJRlG.emSbxZ')
     if main_price_section:
-        price_tag = main_price_section.find('p', class_='h5')
-        unit_tag = main_price_section.find('p', class_='regular')
-        label_tag = main_price_section.find('h6', class_='regular')
+        price_tag = main_price_section.css_first('p.h5')
+        unit_tag = main_price_section.css_first('p.regular')
+        label_tag = main_price_section.css_first('h6.regular')
         
         if label_tag and price_tag:
-            key = label_tag.get_text(strip=True).lower().replace(' ', '_')
-            price_val = price_tag.get_text(strip=True).replace(',', '')
-            unit_val = unit_tag.get_text(strip=True).replace('\xa0', ' ').strip() if unit_tag else ""
+            key = label_tag.text(strip=True).lower().replace(' ', '_')
+            price_val = price_tag.text(strip=True).replace(',', '')
+            unit_val = unit_tag.text(strip=True).replace('\xa0', ' ').strip() if unit_tag else ""
             pricing_info[key] = f"₹{price_val} {unit_val}".strip()
 
     # 2. Extract additional prices from the "Pricing Info" dropdown
-    additional_prices = soup.select('div.pricing-breakup div.grid__col--1-of-2')
+    additional_prices = tree.css('div.pricing-breakup div.grid__col--1-of-2')
     for item in additional_prices:
-        title_tag = item.find('p', class_='text-bold')
-        price_spans = item.find_all('span', class_='text-tertiary')
+        title_tag = item.css_first('p.text-bold')
+        price_spans = item.css('span.text-tertiary')
         
         if title_tag and len(price_spans) > 0:
-            key = title_tag.get_text(strip=True).lower().replace('-', '_').replace(' ', '_')
-            full_price_text = "".join(span.get_text(strip=True).replace('<!-- -->', '').replace('\xa0', ' ') for span in price_spans)
+            key = _KEY_SEP_RE.sub('_', title_tag.text(strip=True).lower())
+            # text() already skips the "<!-- -->" comments React leaves inside the spans
+            full_price_text = "".join(span.text(strip=True) for span in price_spans).replace('\xa0', ' ')
             
-            match = re.match(r'₹([\d,]+)(.*)', full_price_text.strip())
+            match = _PRICE_SPLIT_RE.match(full_price_text.strip())
             if match:
                 value = match.group(1).strip()
                 unit = match.group(2).strip()
                 pricing_info[key] = f"₹{value} {unit}".strip()
 
-    # --- Details Extraction (About & Services) ---
-    about_text = "N/A"
-    services_offered = []
-    
-    about_section = soup.find('div', class_='AboutSection')
-    if about_section:
-        full_details_text = ""
-        info_div = about_section.find('div', class_='info')
-        if info_div:
-            full_details_text = info_div.get_text(separator=' ', strip=True)
-            about_p_tag = info_div.find('p')
-            about_text = about_p_tag.get_text(strip=True) if about_p_tag else full_details_text
-
-        if full_details_text:
-            PREDEFINED_SERVICES = {
-                "Bridal Makeup", "Engagement Makeup", "Party Makeup", "Family Makeup", "Roka", 
-                "Mehendi", "Receptions", "HD Makeup", "Airbrush Makeup", "Waterproof Makeup",
-                "Sweat-resistant", "Glam Makeup", "Natural Makeup", "Draping", "Hair Styling",
-                "False Lashes", "Extensions", "Chic hairstyles", "Travels to venue", "Paid trial"
-            }
-            found_services = set()
-            text_lower = full_details_text.lower()
-            for service in PREDEFINED_SERVICES:
-                if re.search(r'\b' + re.escape(service.lower()) + r'\b', text_lower):
-                    found_services.add(service.strip())
-            services_offered = sorted(list(found_services))
-
     # --- Final JSON Structure ---
-    return {
+    details = {"about": "N/A", "services_offered": []}
+    artist_data = {
         "name": name,
         "location": address,
         "pricing": pricing_info,
-        "details": {
-            "about": about_text,
-            "services_offered": services_offered
-        }
+        "details": details
     }
 
-# --- Main Selenium Function to Fetch and Parse Multiple URLs ---
-def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "all_artists_data.json"):
-    """
-    Initializes a single WebDriver instance to navigate to a list of URLs,
-    fetches the HTML for each, parses the data using BeautifulSoup, and saves all
-    results into a single JSON file.
-    """
-    print("Setting up WebDriver...")
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--log-level=3")
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    print(f"WebDriver setup complete.")
-    
-    all_artists_data = []
+    # --- Details Extraction (About & Services) ---
+    # Without an About section there is nothing left to extract, so skip the services scan
+    about_section = tree.css_first('div.AboutSection')
+    if not about_section or not (info_div := about_section.css_first('div.info')):
+        return artist_data
 
-    try:
-        for i, url in enumerate(urls):
-            print("-" * 50)
-            print(f"Processing URL {i+1}/{len(urls)}: {url}")
-            
-            try:
-                driver.get(url)
-                wait_time = 8 
-                print(f"Waiting for {wait_time} seconds for dynamic content...")
-                time.sleep(wait_time)
-                
-                print("Retrieving and parsing HTML...")
-                html_content = driver.page_source
-                
-                artist_data = parse_makeup_artist_html(html_content)
-                artist_data['source_url'] = url # Add the source URL for reference
-                
-                all_artists_data.append(artist_data)
-                print(f"-> Successfully parsed data for: {artist_data.get('name', 'N/A')}")
+    full_details_text = joined_text(info_div, ' ')
+    about_p_tag = info_div.css_first('p')
+    details["about"] = about_p_tag.text(strip=True) if about_p_tag else full_details_text
 
-            except Exception as e:
-                print(f"-> FAILED to process URL {url}. Error: {e}")
-                continue 
+    if full_details_text:
+        text_lower = full_details_text.lower()
+        found_services = {service.strip() for service in _find_services(text_lower)}
+        details["services_offered"] = sorted(list(found_services))
 
-        if not all_artists_data:
-            print("\nNo data was scraped. The output file will not be created.")
-            return
+    return artist_data
 
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_artists_data, f, indent=4, ensure_ascii=False)
-            
-        print("-" * 50)
-        print(f"\nSUCCESS: Scraped data from {len(all_artists_data)} URL(s).")
-        print(f"All results have been saved to '{output_filename}'")
-
-    finally:
-        print("Closing WebDriver.")
-        driver.quit()
+# --- Main Function to Fetch and Parse Multiple URLs ---
+def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "all_artists_data.json",
+                                  num_workers: int = 6):
+    """
+    Scrapes every makeup artist profile with the shared prefetch, cache, journal and Selenium
+    pipeline in profile_scraper, and saves all results into `output_filename`.
+    """
+    scrape_profiles(urls, parse_makeup_artist_html, output_filename, num_workers)
 
 # --- Main execution block ---
 if __name__ == "__main__":
@@ -272,4 +239,7 @@ if __name__ == "__main__":
 ]
 
     
+    # Drop repeated URLs while keeping the original order
+    target_urls = list(dict.fromkeys(target_urls))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     fetch_and_parse_multiple_urls(urls=target_urls)
\ No newline at end of file
@@ -1,193 +1,208 @@
-import time
-import json
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import logging
+import threading
+import ahocorasick
+from selectolax.lexbor import LexborHTMLParser
 from typing import Dict, Any, List
 
-# --- BS4 Parsing Function for Photographer Page (MODIFIED) ---
+from html_text import joined_text
+from profile_scraper import scrape_profiles
+
+try:
+    import hyperscan
+except ImportError:  # wheels are not available on every platform
+    hyperscan = None
+
+# --- The Master List of Services to search for ---
+PREDEFINED_SERVICES = frozenset({
+    # Core Services
+    "Candid Photography", "Traditional Photography", "Wedding Shoots",
+    "Wedding Cinematography", "Cinematic Video", "Wedding Films",
+    "Traditional Videography", "Bridal Photography", "Bridal Portraits",
+
+    # Pre-Wedding
+    "Pre-Wedding Shoots", "Pre-Wedding Films", "Couple Shoots",
+
+    # Other Events
+    "Engagement Photography", "Maternity Shoots", "Fashion Shoots",
+    "Anniversary Shoots", "Newborn Photography", "Baby Shoots",
+
+    # Deliverables
+    "Albums", "Wedding Albums", "Photo Books", "Digital Albums", "Online Gallery",
+    "Drone", "Crane", "Live Streaming", "Same Day Edit", "Teaser Videos", 
+    "Highlight Reel", "Photo Booth",
+
+    # Styles
+    "Photojournalistic", "Fine Art Wedding Photography", "Documentary Photography",
+
+    # General
+    "Destination Wedding", "Event photography"
+})
+
+def _canonical_service(service: str) -> str:
+    """Standardizes similar terms to avoid redundancy."""
+    if "album" in service.lower():
+        return "Albums"
+    elif any(term in service.lower() for term in ["cinematography", "films", "video"]):
+        if "pre-wedding" in service.lower():
+            return "Pre-Wedding Films"
+        return "Wedding Cinematography / Films"
+    elif any(term in service.lower() for term in ["bridal photography", "bridal portraits"]):
+        return "Bridal Portraits"
+    return service
+
+# Lowercase predefined service -> canonical label it is reported under, so a match is one dict lookup
+SERVICE_TO_CANONICAL = {service.lower(): _canonical_service(service) for service in PREDEFINED_SERVICES}
+
+# Automaton over the lowercase service names, reporting every (also overlapping) hit in one pass:
+# "pre-wedding films" yields both "Pre-Wedding Films" and "Wedding Films"
+_SERVICES_AC = ahocorasick.Automaton()
+for _key in SERVICE_TO_CANONICAL:
+    _SERVICES_AC.add_word(_key, _key)
+_SERVICES_AC.make_automaton()
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+# With hyperscan, one SIMD multi-literal scan finds which service names occur in the text at all
+# (usually none or a few); only those are then confirmed as whole words with their own regex.
+_SERVICE_KEYS = sorted(SERVICE_TO_CANONICAL)
+_SERVICE_WORD_PATTERNS = [re.compile(r'\b' + re.escape(key) + r'\b') for key in _SERVICE_KEYS]
+_SERVICES_DB = None
+if hyperscan:
+    _SERVICES_DB = hyperscan.Database()
+    _SERVICES_DB.compile(
+        expressions=[re.escape(key).encode() for key in _SERVICE_KEYS],
+        ids=list(range(len(_SERVICE_KEYS))),
+        elements=len(_SERVICE_KEYS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_SERVICE_KEYS),
+    )
+# Hyperscan scratch space can't be shared between threads scanning at the same time
+_scratch = threading.local()
+
+def _on_service_match(service_id, start, end, flags, candidates):
+    candidates.add(service_id)
+
+def _find_services(text_lower: str) -> set:
+    """Returns the canonical labels of all services named as whole words in the text."""
+    if _SERVICES_DB is None:
+        found = set()
+        for end, key in _SERVICES_AC.iter(text_lower):
+            start = end - len(key) + 1
+            # Keep only whole-word hits, so e.g. "crane" inside "cranes" doesn't count
+            if (start == 0 or not _is_word_char(text_lower[start - 1])) and \
+                    (end + 1 == len(text_lower) or not _is_word_char(text_lower[end + 1])):
+                found.add(SERVICE_TO_CANONICAL[key])
+        return found
+
+    if not hasattr(_scratch, "space"):
+        _scratch.space = hyperscan.Scratch(_SERVICES_DB)
+    candidates = set()
+    _SERVICES_DB.scan(text_lower.encode(), match_event_handler=_on_service_match, context=candidates,
+                      scratch=_scratch.space)
+    return {SERVICE_TO_CANONICAL[_SERVICE_KEYS[i]] for i in candidates if _SERVICE_WORD_PATTERNS[i].search(text_lower)}
+
+# Patterns used on every page, compiled once
+# Separators in a package label (" + " before single spaces) and a price title, turned into underscores
+_LABEL_SEP_RE = re.compile(r' \+ | ')
+_KEY_SEP_RE = re.compile(r'[- ]')
+# Drops thousands separators and turns non-breaking spaces into spaces in a single pass
+_PRICE_TRANS = str.maketrans({',': '', '\xa0': ' '})
+
+# Fields of a price package, keyed by (tag name, class) so its subtree is only walked once
+_PACKAGE_FIELDS = {('h6', 'text-secondary'): 'label', ('p', 'h5'): 'price', ('p', 'regular'): 'unit'}
+_PACKAGE_FIELDS_SELECTOR = ", ".join(f"{tag}.{css_class}" for tag, css_class in _PACKAGE_FIELDS)
+
+# --- Parsing Function for Photographer Page (selectolax) ---
 def parse_photographer_html(html_content: str) -> Dict[str, Any]:
     """
     Parses the HTML content of a single photographer's page and returns a structured dictionary.
     This version relies exclusively on a predefined keyword list to extract services from the text.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    tree = LexborHTMLParser(html_content)
 
     # --- Name Extraction ---
     name = "N/A"
-    name_tag = soup.select_one('h1.h4.text-bold')
+    name_tag = tree.css_first('h1.h4.text-bold')
     if name_tag:
-        name = name_tag.get_text(strip=True)
+        name = name_tag.text(strip=True)
 
     # --- Address Extraction ---
     address = "N/A"
-    address_div = soup.select_one('div.addr-right h6 > span')
+    address_div = tree.css_first('div.addr-right h6 > span')
     if address_div:
-        address = address_div.get_text(strip=True)
+        address = address_div.text(strip=True)
 
     # --- Pricing Extraction ---
     pricing_info = {}
-    price_packages = soup.select('div.VendorPricing .f-space-between.sc-jzJRlG.emSbxZ div > div')
+    price_packages = tree.css('div.VendorPricing .f-space-between.sc-jzJRlG.emSbxZ div > div')
     for package in price_packages:
-        label_tag = package.find('h6', class_='text-secondary')
-        price_tag = package.find('p', class_='h5')
-        unit_tag = package.find('p', class_='regular')
+        # First label, price and unit tag in document order, found in a single query
+        fields = {}
+        for tag in package.css(_PACKAGE_FIELDS_SELECTOR):
+            for css_class in (tag.attributes.get('class') or '').split():
+                field = _PACKAGE_FIELDS.get((tag.tag, css_class))
+                if field and field not in fields:
+                    fields[field] = tag
+        label_tag = fields.get('label')
+        price_tag = fields.get('price')
+        unit_tag = fields.get('unit')
         if label_tag and price_tag:
-            key = label_tag.get_text(strip=True).lower().replace(' + ', '_').replace(' ', '_')
-            price_text = price_tag.get_text(strip=True).replace(',', '')
-            unit_text = unit_tag.get_text(strip=True) if unit_tag else ""
-            full_price_string = f"₹{price_text} {unit_text}".strip().replace('\xa0', ' ')
+            key = _LABEL_SEP_RE.sub('_', label_tag.text(strip=True).lower())
+            price_text = price_tag.text(strip=True).translate(_PRICE_TRANS)
+            unit_text = unit_tag.text(strip=True).replace('\xa0', ' ') if unit_tag else ""
+            full_price_string = f"₹{price_text} {unit_text}".strip()
             pricing_info[key] = full_price_string
 
-    additional_prices = soup.select('div.pricing-breakup div.grid__col--1-of-2')
+    additional_prices = tree.css('div.pricing-breakup div.grid__col--1-of-2')
     for item in additional_prices:
-        title_tag = item.find('p', class_='text-bold')
-        price_spans = item.find_all('span', class_='text-tertiary')
+        title_tag = item.css_first('p.text-bold')
+        price_spans = item.css('span.text-tertiary')
         if title_tag and len(price_spans) > 1:
-            key = title_tag.get_text(strip=True).lower().replace('-', '_').replace(' ', '_')
-            currency_symbol = price_spans[0].get_text(strip=True)
-            value_text = price_spans[1].get_text(strip=True).replace('<!-- -->', '').replace('\xa0', ' ')
+            key = _KEY_SEP_RE.sub('_', title_tag.text(strip=True).lower())
+            currency_symbol = price_spans[0].text(strip=True)
+            # text() already skips the "<!-- -->" comments React puts inside the span
+            value_text = price_spans[1].text(strip=True).replace('\xa0', ' ')
             pricing_info[key] = f"{currency_symbol}{value_text}".strip()
 
-    # --- Details Extraction (About & Services) ---
-    about_text = "N/A"
-    services_offered = []
-    
-    about_section = soup.find('div', class_='AboutSection')
-    if about_section:
-        full_details_text = ""
-        info_div = about_section.find('div', class_='info')
-        if info_div:
-            full_details_text = info_div.get_text(separator=' ', strip=True)
-            about_p_tag = info_div.find('p')
-            if about_p_tag:
-                about_text = about_p_tag.get_text(strip=True)
-            else:
-                about_text = full_details_text # Fallback to full text if no <p> tag
-
-        # Sole Method: Search the full text for an expanded list of keywords.
-        if full_details_text:
-            PREDEFINED_SERVICES = {
-                # Core Services
-                "Candid Photography", "Traditional Photography", "Wedding Shoots",
-                "Wedding Cinematography", "Cinematic Video", "Wedding Films",
-                "Traditional Videography", "Bridal Photography", "Bridal Portraits",
-                
-                # Pre-Wedding
-                "Pre-Wedding Shoots", "Pre-Wedding Films", "Couple Shoots",
-                
-                # Other Events
-                "Engagement Photography", "Maternity Shoots", "Fashion Shoots",
-                "Anniversary Shoots", "Newborn Photography", "Baby Shoots",
-                
-                # Deliverables
-                "Albums", "Wedding Albums", "Photo Books", "Digital Albums", "Online Gallery",
-                "Drone", "Crane", "Live Streaming", "Same Day Edit", "Teaser Videos", 
-                "Highlight Reel", "Photo Booth",
-                
-                # Styles
-                "Photojournalistic", "Fine Art Wedding Photography", "Documentary Photography",
-                
-                # General
-                "Destination Wedding", "Event photography"
-            }
-            
-            found_services = set()
-            text_lower = full_details_text.lower()
-            
-            for service in PREDEFINED_SERVICES:
-                if re.search(r'\b' + re.escape(service.lower()) + r'\b', text_lower):
-                    # Standardize similar terms to avoid redundancy
-                    if "album" in service.lower():
-                        found_services.add("Albums")
-                    elif any(term in service.lower() for term in ["cinematography", "films", "video"]):
-                        if "pre-wedding" in service.lower():
-                            found_services.add("Pre-Wedding Films")
-                        else:
-                            found_services.add("Wedding Cinematography / Films")
-                    elif any(term in service.lower() for term in ["bridal photography", "bridal portraits"]):
-                        found_services.add("Bridal Portraits")
-                    else:
-                        found_services.add(service)
-            
-            services_offered = sorted(list(found_services))
-
     # --- Final JSON Structure ---
-    return {
+    details = {"about": "N/A", "services_offered": []}
+    photographer_data = {
         "name": name,
         "location": address,
         "pricing": pricing_info,
-        "details": {
-            "about": about_text,
-            "services_offered": services_offered
-        }
+        "details": details
     }
 
-# --- Main Selenium Function to Fetch and Parse Multiple URLs ---
-def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "photographers_data.json"):
-    """
-    Initializes a single WebDriver instance to navigate to a list of URLs,
-    fetches the HTML for each, parses the data using BeautifulSoup, and saves all
-    results into a single JSON file.
-    """
-    print("Setting up WebDriver...")
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--log-level=3")
-    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    
-    print(f"WebDriver setup complete.")
-    
-    all_photographers_data = []
-
-    try:
-        for i, url in enumerate(urls):
-            print("-" * 50)
-            print(f"Processing URL {i+1}/{len(urls)}: {url}")
-            
-            try:
-                driver.get(url)
-                wait_time = 8 
-                print(f"Waiting for {wait_time} seconds for dynamic content...")
-                time.sleep(wait_time)
-                
-                print("Retrieving and parsing HTML...")
-                html_content = driver.page_source
-                
-                photographer_data = parse_photographer_html(html_content)
-                photographer_data['source_url'] = url
-                
-                all_photographers_data.append(photographer_data)
-                print(f"-> Successfully parsed data for: {photographer_data.get('name', 'N/A')}")
+    # --- Details Extraction (About & Services) ---
+    # Without an About section there is nothing left to extract, so skip the services scan
+    about_section = tree.css_first('div.AboutSection')
+    if not about_section or not (info_div := about_section.css_first('div.info')):
+        return photographer_data
 
-            except Exception as e:
-                print(f"-> FAILED to process URL {url}. Error: {e}")
-                continue 
+    full_details_text = joined_text(info_div, ' ')
+    about_p_tag = info_div.css_first('p')
+    if about_p_tag:
+        details["about"] = about_p_tag.text(strip=True)
+    else:
+        details["about"] = full_details_text # Fallback to full text if no <p> tag
 
-        if not all_photographers_data:
-            print("\nNo data was scraped. The output file will not be created.")
-            return
+    # Sole Method: Search the full text for an expanded list of keywords.
+    if full_details_text:
+        text_lower = full_details_text.lower()
+        found_services = _find_services(text_lower)
+        details["services_offered"] = sorted(list(found_services))
 
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(all_photographers_data, f, indent=4, ensure_ascii=False)
-            
-        print("-" * 50)
-        print(f"\nSUCCESS: Scraped data from {len(all_photographers_data)} URL(s).")
-        print(f"All results have been saved to '{output_filename}'")
+    return photographer_data
 
-    finally:
-        print("Closing WebDriver.")
-        driver.quit()
+# --- Main Function to Fetch and Parse Multiple URLs ---
+def fetch_and_parse_multiple_urls(urls: List[str], output_filename: str = "photographers_data.json",
+                                  num_workers: int = 6):
+    """
+    Scrapes every photographer profile with the shared prefetch, cache, journal and Selenium
+    pipeline in profile_scraper, and saves all results into `output_filename`.
+    """
+    scrape_profiles(urls, parse_photographer_html, output_filename, num_workers)
 
 # --- Main execution block ---
 if __name__ == "__main__":
@@ -290,4 +305,7 @@ if __name__ == "__main__":
 ]
 
     
+    # The list has repeats; drop them while keeping the original order
+    target_urls = list(dict.fromkeys(target_urls))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
     fetch_and_parse_multiple_urls(urls=target_urls)
\ No newline at end of file
@@ -0,0 +1,254 @@
+import os
+import asyncio
+import gzip
+import hashlib
+import tempfile
+import time
+import platform
+import queue
+import threading
+import logging
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+import httpx
+import orjson
+from typing import IO, Callable, Dict, Any, List, Optional, Tuple
+
+from driver_service import BLOCKED_URL_PATTERNS, USER_AGENT, load_page, make_service, wait_ready
+from journal import append_record, load_records
+
+logger = logging.getLogger(__name__)
+
+# Either of these means the profile has rendered and the page source can be parsed
+PROFILE_READY_SELECTORS = (".AboutSection", "h1.h4.text-bold")
+
+# Plain HTTP requests in flight at once while prefetching server-rendered pages
+HTTP_CONCURRENCY = 20
+# Settings of the one HTTP/2 client every prefetch request goes through, so all pages are
+# multiplexed over a few kept-alive connections instead of a TLS handshake per URL
+HTTP_HEADERS = {"user-agent": USER_AGENT}
+HTTP_LIMITS = httpx.Limits(max_connections=HTTP_CONCURRENCY, max_keepalive_connections=HTTP_CONCURRENCY)
+
+# --- Plain HTTP Prefetch ---
+async def fetch_html_async(urls: List[str]) -> List[Optional[str]]:
+    """
+    Fetches all URLs concurrently over HTTP/2 without a browser. Returns the HTML of
+    each page in URL order, or None where the request failed.
+    """
+    limit = asyncio.Semaphore(HTTP_CONCURRENCY)
+    # Created per call: an AsyncClient's connections belong to the event loop that opened them
+    async with httpx.AsyncClient(http2=True, headers=HTTP_HEADERS, timeout=10.0, follow_redirects=True,
+                                 limits=HTTP_LIMITS) as client:
+        async def fetch(url: str) -> Optional[str]:
+            async with limit:
+                try:
+                    response = await client.get(url)
+                    response.raise_for_status()
+                    return response.text
+                except httpx.HTTPError as e:
+                    logger.warning("Plain HTTP fetch failed for %s (%s), will use Selenium.", url, e)
+                    return None
+
+        return await asyncio.gather(*[fetch(url) for url in urls])
+
+# --- HTML Cache ---
+# Gzipped HTML of every complete page, one file per URL, so reruns within a day skip the network
+CACHE_DIR = Path(".scrape_cache")
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+def _html_cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()}.html.gz"
+
+def _load_cached_html(url: str) -> Optional[str]:
+    """Returns the HTML cached for a URL if it was saved less than CACHE_TTL_SECONDS ago."""
+    path = _html_cache_path(url)
+    try:
+        if time.time() - path.stat().st_mtime >= CACHE_TTL_SECONDS:
+            return None
+        return gzip.decompress(path.read_bytes()).decode('utf-8')
+    except (OSError, EOFError, ValueError):
+        return None
+
+def _store_html(url: str, html_content: str):
+    """Writes a page to the cache atomically so an interrupted run never leaves a half-written file."""
+    CACHE_DIR.mkdir(exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(gzip.compress(html_content.encode('utf-8')))
+        os.replace(tmp_path, _html_cache_path(url))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+# --- Selenium Helpers ---
+def _setup_driver() -> webdriver.Chrome:
+    """Creates a headless Chrome WebDriver configured for scraping."""
+    chrome_options = Options()
+    # Return from driver.get() at DOMContentLoaded; the explicit wait covers the rest
+    chrome_options.page_load_strategy = 'eager'
+    chrome_options.add_argument("--headless=new")
+    # --disable-gpu is only still needed on some Linux CI images
+    if platform.system() == "Linux" and os.environ.get("CI"):
+        chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    # Skip background services, extensions and image downloads a scrape never needs
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--disable-background-networking")
+    chrome_options.add_argument("--disable-sync")
+    chrome_options.add_argument("--disable-default-apps")
+    chrome_options.add_argument("--disable-features=Translate,MediaRouter,OptimizationHints")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+
+    service = make_service()
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+    # Drop images, fonts and stylesheets before they hit the network
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+    return driver
+
+def _worker(url_queue: "queue.Queue[Tuple[int, str]]", results: List[Tuple[int, Dict[str, Any]]],
+            results_lock: threading.Lock, journal: IO[bytes], driver: webdriver.Chrome,
+            parse_html: Callable[[str], Dict[str, Any]]):
+    """
+    Scrapes URLs taken from `url_queue` with one warm driver until the queue is empty,
+    adding each parsed page to `results` together with its position in the URL list
+    and appending it to the `journal` file.
+    """
+    while True:
+        try:
+            i, url = url_queue.get_nowait()
+        except queue.Empty:
+            return
+
+        logger.debug("Processing URL %d: %s", i + 1, url)
+        try:
+            load_page(driver, url)
+            # Return as soon as the profile content is in the DOM instead of always sleeping
+            if not wait_ready(driver, PROFILE_READY_SELECTORS):
+                logger.warning("Timed out waiting for %s to render, parsing whatever has loaded.", url)
+
+            html_content = driver.page_source
+            record = parse_html(html_content)
+            record['source_url'] = url # Add the source URL for reference
+
+            with results_lock:
+                results.append((i, record))
+                append_record(journal, record)
+            if record.get('name') != "N/A":
+                _store_html(url, html_content)
+            logger.debug("Parsed data for %s from %s", record.get('name', 'N/A'), url)
+
+        except Exception as e:
+            logger.error("FAILED to process URL %s. Error: %s", url, e)
+
+# --- Main Function to Fetch and Parse Multiple Profile URLs ---
+def scrape_profiles(urls: List[str], parse_html: Callable[[str], Dict[str, Any]], output_filename: str,
+                    num_workers: int = 6):
+    """
+    Fetches every page over plain HTTP first and parses it with `parse_html`, which
+    returns a record with "N/A" as its name when the profile has not rendered. Pages
+    whose server-rendered HTML lacks the profile name are left to `num_workers` headless
+    WebDrivers that work through a shared queue. All results are saved into a single
+    JSON file in the original URL order.
+
+    Complete pages are cached gzipped in CACHE_DIR, and a rerun within CACHE_TTL_SECONDS
+    parses them from there without any network request.
+
+    Each record is also appended to a .jsonl file next to `output_filename` as soon as it
+    is parsed. If a run is interrupted, the next one resumes from it and skips the URLs
+    already scraped; the .jsonl file is removed once the JSON file has been written.
+    """
+    if not urls:
+        logger.warning("No URLs were given. Nothing to scrape.")
+        return
+
+    jsonl_filename = os.path.splitext(output_filename)[0] + '.jsonl'
+    positions = {url: i for i, url in enumerate(urls)}
+    results = []
+    results_lock = threading.Lock()
+    url_queue = queue.Queue()
+    drivers = []
+
+    # Resume from the records saved by an interrupted run. Pages that failed to render
+    # (no profile name) are left out, so their URLs are scraped again.
+    for record in load_records(jsonl_filename):
+        if record.get('name') == "N/A":
+            continue
+        results.append((positions.get(record.get('source_url'), len(urls)), record))
+    seen = {record.get('source_url') for _, record in results}
+    if seen:
+        logger.info("Resuming: %d URL(s) already scraped in '%s' will be skipped.", len(seen), jsonl_filename)
+    pending = [(i, url) for i, url in enumerate(urls) if url not in seen]
+
+    journal = open(jsonl_filename, 'ab')
+
+    try:
+        pages = [_load_cached_html(url) for _, url in pending]
+        is_cached = [html_content is not None for html_content in pages]
+        uncached = [n for n, cached in enumerate(is_cached) if not cached]
+        logger.info("%d page(s) found in '%s', fetching %d over plain HTTP...", len(pending) - len(uncached), CACHE_DIR, len(uncached))
+        for n, html_content in zip(uncached, asyncio.run(fetch_html_async([pending[n][1] for n in uncached]))):
+            pages[n] = html_content
+
+        for (i, url), html_content, cached in zip(pending, pages, is_cached):
+            record = parse_html(html_content) if html_content else None
+            # Only a page that already carries the profile name (h1.h4.text-bold) is complete
+            if record and record.get('name') != "N/A":
+                record['source_url'] = url
+                results.append((i, record))
+                append_record(journal, record)
+                if not cached:
+                    _store_html(url, html_content)
+            else:
+                url_queue.put((i, url))
+        logger.info("%d page(s) parsed without a browser, %d left for Selenium.", len(pending) - url_queue.qsize(), url_queue.qsize())
+
+        num_workers = min(num_workers, url_queue.qsize())
+        if num_workers:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                logger.info("Setting up %d WebDrivers...", num_workers)
+                startups = [executor.submit(_setup_driver) for _ in range(num_workers)]
+                for startup in startups:
+                    try:
+                        drivers.append(startup.result())
+                    except Exception as e:
+                        logger.error("Failed to start a WebDriver. Error: %s", e)
+                if not drivers:
+                    logger.warning("No WebDriver could be started. Only the plain HTTP results are kept.")
+                else:
+                    logger.info("WebDriver setup complete.")
+
+                wait([executor.submit(_worker, url_queue, results, results_lock, journal, driver, parse_html) for driver in drivers])
+
+        if not results:
+            logger.warning("No data was scraped. The output file will not be created.")
+            journal.close()
+            os.remove(jsonl_filename)
+            return
+
+        all_records = [record for _, record in sorted(results, key=lambda r: r[0])]
+
+        with open(output_filename, 'wb') as f:
+            f.write(orjson.dumps(all_records, option=orjson.OPT_INDENT_2))
+        journal.close()
+        os.remove(jsonl_filename)
+            
+        logger.info("Scraped data from %d URLs. All results have been saved to '%s'", len(all_records), output_filename)
+
+    finally:
+        journal.close()
+        logger.debug("Closing WebDrivers.")
+        for driver in drivers:
+            driver.quit()
@@ -1,7 +1,9 @@
+import json
+
 def clean_links(input_file, output_file=None):
     """
     Read links from input file, remove duplicates while preserving order, and save to output file
-    as a Python list of strings.
+    as a JSON array of strings.
     If output_file is not provided, it will overwrite the input file.
     
     Args:
@@ -15,39 +17,30 @@ def clean_links(input_file, output_file=None):
     if output_file is None:
         output_file = input_file
     
-    # Read all lines from the file
-    with open(input_file, 'r', encoding='utf-8') as f:
-        # Read lines and strip, ignoring empty lines
-        lines = [line.strip().strip('"') for line in f.readlines() if line.strip()]
-    
-    # Remove duplicates while preserving order
+    # Read the file line by line, keeping only the first occurrence of each link
     seen = set()
     unique_links = []
-    for link in lines:
-        # Clean the link (remove any extra whitespace or quotes)
-        clean_link = link.strip().strip('"')
-        if clean_link and clean_link not in seen:
-            seen.add(clean_link)
-            unique_links.append(clean_link)
+    total_links = 0
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            # Clean the link (remove any extra whitespace or quotes), ignoring empty lines
+            clean_link = line.strip().strip('"')
+            if not clean_link:
+                continue
+            total_links += 1
+            if clean_link not in seen:
+                seen.add(clean_link)
+                unique_links.append(clean_link)
     
-    # Save the unique links back to the output file as a Python list
+    # Save the unique links to the output file as a list of strings
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write('[\n')  # Start the list
-        
-        # Write each link, enclosed in quotes, followed by a comma and newline
-        for i, link in enumerate(unique_links):
-            # Check if it's the last element to avoid a trailing comma
-            if i == len(unique_links) - 1:
-                f.write(f'    "{link}"\n')
-            else:
-                f.write(f'    "{link}",\n')
-        
-        f.write(']\n')  # End the list
+        json.dump(unique_links, f, indent=4, ensure_ascii=False)
+        f.write('\n')
     
-    print(f"Original links: {len(lines)}")
+    print(f"Original links: {total_links}")
     print(f"Unique links: {len(unique_links)}")
-    print(f"Removed {len(lines) - len(unique_links)} duplicate links")
-    print(f"Cleaned links saved to: {output_file} (as a Python list)")
+    print(f"Removed {total_links - len(unique_links)} duplicate links")
+    print(f"Cleaned links saved to: {output_file} (as a JSON array)")
     
     return unique_links
 